@@ -12,8 +12,8 @@ import os
 import random
 import re
 import time
-from binascii import unhexlify, hexlify
-from collections import Counter, defaultdict
+from binascii import hexlify
+from collections import defaultdict
 from collections import OrderedDict
 from datetime import datetime, timezone
 from enum import unique, IntEnum
@@ -36,6 +36,11 @@ from stp_core.crypto.util import isHexKey, isHex
 from stp_core.network.exceptions import \
     InvalidEndpointIpAddress, InvalidEndpointPort
 
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = None
+
 # TODO Do not remove the next import until imports in indy are fixed
 from stp_core.common.util import adict
 
@@ -44,6 +49,26 @@ T = TypeVar('T')
 Seconds = TypeVar("Seconds", int, float)
 
 
+# Prefix of values encrypted with AES-GCM, values without it are encrypted
+# with `SecretBox`
+AES_GCM_PREFIX = "aesgcm:"
+
+
+@functools.lru_cache(maxsize=None)
+def _cpuHasAesNi() -> bool:
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('flags'):
+                    return 'aes' in line.split()
+    except OSError:
+        pass
+    return False
+
+
+_CANON_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':')).encode
+
+
 def randomString(size: int = 20) -> str:
     """
     Generate a random string in hex of the specified size
@@ -96,29 +121,33 @@ def mostCommonElement(elements: Iterable[T], to_hashable_f: Callable=None):
     :return: element which is the most frequent in the collection and
         the number of its occurrences
     """
-    class _Hashable(collections.abc.Hashable):
-        def __init__(self, orig):
-            self.orig = orig
-
-            if isinstance(orig, collections.Hashable):
-                self.hashable = orig
-            elif to_hashable_f is not None:
-                self.hashable = to_hashable_f(orig)
-            else:
-                self.hashable = json.dumps(orig, sort_keys=True)
-
-        def __eq__(self, other):
-            return self.hashable == other.hashable
-
-        def __hash__(self):
-            return hash(self.hashable)
-
-    _elements = (_Hashable(el) for el in elements)
-    most_common, counter = Counter(_elements).most_common(n=1)[0]
-    return most_common.orig, counter
+    # hashable presentation -> [first such element, count, first position]
+    counts = {}
+    best = None
+    for i, el in enumerate(elements):
+        if isinstance(el, collections.Hashable):
+            key = el
+        elif to_hashable_f is not None:
+            key = to_hashable_f(el)
+        else:
+            key = json.dumps(el, sort_keys=True)
+        entry = counts.get(key)
+        if entry is None:
+            entry = counts[key] = [el, 0, i]
+        entry[1] += 1
+        # on ties prefer the element seen first, as `Counter.most_common` does
+        if best is None or entry[1] > best[1] or \
+                (entry[1] == best[1] and entry[2] < best[2]):
+            best = entry
+    if best is None:
+        raise IndexError("no elements to choose from")
+    return best[0], best[1]
 
 
 def updateNamedTuple(tupleToUpdate: NamedTuple, **kwargs):
+    if isinstance(tupleToUpdate, tuple):
+        return tupleToUpdate._replace(**kwargs)
+    # Messages are not namedtuples anymore but still provide `_asdict`
     tplData = dict(tupleToUpdate._asdict())
     tplData.update(kwargs)
     return tupleToUpdate.__class__(**tplData)
@@ -141,33 +170,46 @@ def objSearchReplace(obj: Any,
     if checked is None:
         checked = set()
 
+    # ids of objects replaced by `toFrom`, so each attribute is checked with
+    # a single lookup
+    replacements = {id(old): (old, new) for old, new in toFrom.items()}
+
+    def attrPairs(o):
+        pairs = [(i, getattr(o, i)) for i in dir(o) if not i.startswith("__")]
+        if isinstance(o, Mapping):
+            pairs += [x for x in iteritems(o)]
+        elif isinstance(o, (Sequence, Set)) and \
+                not isinstance(o, string_types):
+            pairs += [x for x in enumerate(o)]
+        return iter(pairs)
+
+    # Depth first walk with an explicit stack instead of recursion; `checked`
+    # holds the objects on the current path to avoid cycles
     checked.add(id(obj))
-    pairs = [(i, getattr(obj, i)) for i in dir(obj) if not i.startswith("__")]
-
-    if isinstance(obj, Mapping):
-        pairs += [x for x in iteritems(obj)]
-    elif isinstance(obj, (Sequence, Set)) and not isinstance(obj, string_types):
-        pairs += [x for x in enumerate(obj)]
-
-    for nm, o in pairs:
-        if id(o) not in checked:
-            mutated = False
-            for old, new in toFrom.items():
-                if id(o) == id(old):
-                    logging.debug(
-                        "{}in object {}, attribute {} changed from {} to {}". format(
-                            logMsg + ": " if logMsg else "", obj, nm, old, new))
-                    if isinstance(obj, dict):
-                        obj[nm] = new
-                    else:
-                        setattr(obj, nm, new)
-                    mutated = True
-            if not mutated:
-                if deepLevel is not None and deepLevel == 0:
-                    continue
-                objSearchReplace(o, toFrom, checked, logMsg, deepLevel -
-                                 1 if deepLevel is not None else deepLevel)
-    checked.remove(id(obj))
+    stack = [(obj, attrPairs(obj), deepLevel)]
+    while stack:
+        cur, pairs, level = stack[-1]
+        for nm, o in pairs:
+            if id(o) in checked:
+                continue
+            replacement = replacements.get(id(o))
+            if replacement is not None:
+                old, new = replacement
+                logging.debug(
+                    "{}in object {}, attribute {} changed from {} to {}". format(
+                        logMsg + ": " if logMsg else "", cur, nm, old, new))
+                if isinstance(cur, dict):
+                    cur[nm] = new
+                else:
+                    setattr(cur, nm, new)
+            elif level is None or level != 0:
+                checked.add(id(o))
+                stack.append((o, attrPairs(o),
+                              level - 1 if level is not None else level))
+                break
+        else:
+            checked.remove(id(cur))
+            stack.pop()
 
 
 def getRandomPortNumber() -> int:
@@ -193,28 +235,63 @@ async def runall(corogen):
     return results
 
 
+def _symmetricKeyBytes(secretKey: Union[str, bytes]) -> bytes:
+    if isHex(secretKey):
+        return bytes(bytearray.fromhex(secretKey))
+    if not isinstance(secretKey, bytes):
+        error("Secret key must be either in hex or bytes")
+    return secretKey
+
+
 def getSymmetricallyEncryptedVal(
-        val, secretKey: Union[str, bytes]=None) -> Tuple[str, str]:
+        val, secretKey: Union[str, bytes]=None,
+        useAesGcm: bool=False) -> Tuple[str, str]:
     """
     Encrypt the provided value with symmetric encryption
 
     :param val: the value to encrypt
     :param secretKey: Optional key, if provided should be either in hex or bytes
+    :param useAesGcm: encrypt with AES-256-GCM instead of `SecretBox` if the
+        CPU supports AES-NI and `cryptography` is installed. The encrypted
+        value is then prefixed with `AES_GCM_PREFIX`
     :return: Tuple of the encrypted value and secret key encoded in hex
     """
     if isinstance(val, str):
         val = val.encode("utf-8")
     if secretKey:
-        if isHex(secretKey):
-            secretKey = bytes(bytearray.fromhex(secretKey))
-        elif not isinstance(secretKey, bytes):
-            error("Secret key must be either in hex or bytes")
+        secretKey = _symmetricKeyBytes(secretKey)
+    if useAesGcm and AESGCM is not None and _cpuHasAesNi():
+        key = secretKey or AESGCM.generate_key(bit_length=256)
+        nonce = os.urandom(12)
+        encrypted = nonce + AESGCM(key).encrypt(nonce, val, None)
+        return AES_GCM_PREFIX + encrypted.hex(), key.hex()
+    if secretKey:
         box = libnacl.secret.SecretBox(secretKey)
     else:
         box = libnacl.secret.SecretBox()
     return box.encrypt(val).hex(), box.sk.hex()
 
 
+def getSymmetricallyDecryptedVal(
+        encryptedVal: str, secretKey: Union[str, bytes]) -> bytes:
+    """
+    Decrypt a value encrypted by `getSymmetricallyEncryptedVal`
+
+    :param encryptedVal: the encrypted value in hex, possibly prefixed with
+        `AES_GCM_PREFIX`
+    :param secretKey: the key, either in hex or bytes
+    :return: the decrypted value
+    """
+    secretKey = _symmetricKeyBytes(secretKey)
+    if encryptedVal.startswith(AES_GCM_PREFIX):
+        if AESGCM is None:
+            error("cryptography is needed to decrypt AES-GCM values")
+        encrypted = bytes.fromhex(encryptedVal[len(AES_GCM_PREFIX):])
+        return AESGCM(secretKey).decrypt(encrypted[:12], encrypted[12:], None)
+    box = libnacl.secret.SecretBox(secretKey)
+    return box.decrypt(bytes.fromhex(encryptedVal))
+
+
 def getMaxFailures(nodeCount: int) -> int:
     r"""
     The maximum number of Byzantine failures permissible by the RBFT system.
@@ -266,6 +343,27 @@ def prime_gen() -> int:
             D[x] = p
 
 
+def prime_gen_segmented(limit: int) -> int:
+    """
+    A generator for prime numbers up to and including `limit`. Faster than
+    `prime_gen` when an upper bound is known, since composites are crossed
+    out with slice assignments on a byte array instead of dict updates.
+    """
+    if limit < 2:
+        return
+    yield 2
+    # sieve[i] is set when 2 * i + 1 is prime
+    sieve = bytearray([1]) * ((limit + 1) // 2)
+    sieve[0] = 0
+    p = 3
+    while p * p <= limit:
+        if sieve[p // 2]:
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, len(sieve), p)))
+        p += 2
+    yield from itertools.compress(range(1, limit + 1, 2), sieve)
+
+
 async def untilTrue(condition, *args, timeout=5) -> bool:
     """
     Keep checking the condition till it is true or a timeout is reached
@@ -277,17 +375,20 @@ async def untilTrue(condition, *args, timeout=5) -> bool:
     result = False
     start = time.perf_counter()
     elapsed = 0
+    # Poll often at first, backing off up to every 100ms
+    delay = .001
     while elapsed < timeout:
         result = condition(*args)
         if result:
             break
-        await asyncio.sleep(.1)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, .1)
         elapsed = time.perf_counter() - start
     return result
 
 
 def firstKey(d: Dict):
-    return next(iter(d.keys()))
+    return next(iter(d))
 
 
 def firstValue(d: Dict):
@@ -295,7 +396,7 @@ def firstValue(d: Dict):
 
 
 def getCryptonym(identifier):
-    return base58.b58encode(unhexlify(identifier.encode())).decode() \
+    return base58.b58encode(bytes.fromhex(identifier)).decode() \
         if isHexKey(identifier) else identifier
 
 
@@ -304,9 +405,12 @@ def getFriendlyIdentifier(dest):
 
 
 def hexToFriendly(hx):
-    if isinstance(hx, str):
-        hx = hx.encode()
-    raw = unhexlify(hx)
+    # `bytes.fromhex` would accept whitespace between bytes
+    if not isHex(hx):
+        raise ValueError("Not a hex value: {}".format(hx))
+    if isinstance(hx, bytes):
+        hx = hx.decode()
+    raw = bytes.fromhex(hx)
     return rawToFriendly(raw)
 
 
@@ -330,7 +434,7 @@ def friendlyToRaw(f):
 
 
 def cryptonymToHex(cryptonym: str) -> bytes:
-    return hexlify(base58.b58decode(cryptonym.encode()))
+    return base58.b58decode(cryptonym).hex().encode()
 
 
 def runWithLoop(loop, callback, *args, **kwargs):
@@ -342,28 +446,31 @@ def runWithLoop(loop, callback, *args, **kwargs):
 
 def checkIfMoreThanFSameItems(items, maxF):
     # TODO: separate json serialization into serialization.py
-    jsonified_items = [json.dumps(item, sort_keys=True) for item in items]
     counts = defaultdict(int)
-    for j_item in jsonified_items:
-        counts[j_item] += 1
-    if counts and counts[max(counts, key=counts.get)] > maxF:
-        return json.loads(max(counts, key=counts.get))
-    else:
-        return False
+    winner = None
+    best = 0
+    for item in items:
+        key = _CANON_ENCODER(item)
+        counts[key] += 1
+        if counts[key] > best:
+            best, winner = counts[key], item
+    return winner if best > maxF else False
 
 
 def friendlyEx(ex: Exception) -> str:
     curEx = ex
-    friendly = ""
-    end = ""
+    parts = []
+    causes = 0
+    hasText = False
     while curEx:
-        if len(friendly):
-            friendly += " [caused by "
-            end += "]"
-        friendly += "{}".format(curEx)
+        if hasText:
+            parts.append(" [caused by ")
+            causes += 1
+        part = "{}".format(curEx)
+        parts.append(part)
+        hasText = hasText or bool(part)
         curEx = curEx.__cause__
-    friendly += end
-    return friendly
+    return "".join(parts) + "]" * causes
 
 
 def updateFieldsWithSeqNo(fields):
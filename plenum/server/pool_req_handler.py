@@ -140,7 +140,7 @@ class PoolRequestHandler(RequestHandler):
     @staticmethod
     def dataErrorWhileValidating(data, skipKeys):
         reqKeys = {NODE_IP, NODE_PORT, CLIENT_IP, CLIENT_PORT, ALIAS}
-        if not skipKeys and not reqKeys.issubset(set(data.keys())):
+        if not skipKeys and not reqKeys <= data.keys():
             return 'Missing some of {}'.format(reqKeys)
 
         nip = data.get(NODE_IP, 'nip')
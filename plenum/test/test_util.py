@@ -1,15 +1,24 @@
 import math
+from collections import namedtuple
 from itertools import combinations
 
 import time
 
 import os
+
+import pytest
 from libnacl import crypto_hash_sha256
 
 from plenum.common.util import randomString, compare_3PC_keys, \
     check_if_all_equal_in_list, min_3PC_key, max_3PC_key, get_utc_epoch, \
-    mostCommonElement
-from stp_core.network.util import evenCompare, distributedConnectionMap
+    mostCommonElement, checkIfMoreThanFSameItems, prime_gen, \
+    prime_gen_segmented, updateNamedTuple, getSymmetricallyEncryptedVal, \
+    getSymmetricallyDecryptedVal, AES_GCM_PREFIX, getCryptonym, \
+    hexToFriendly, cryptonymToHex, friendlyToHex
+from stp_core.network.util import evenCompare, evenCompareKey, \
+    distributedConnectionMap
+import plenum.common.util
+from plenum.common.messages.node_messages import CheckpointState
 from plenum.test.greek import genNodeNames
 
 
@@ -29,6 +38,14 @@ def test_even_compare():
         print("{}: {}".format(v, hashit(v)))
 
 
+def test_even_compare_key():
+    vals = genNodeNames(24)
+    ordered = sorted(vals, key=evenCompareKey)
+    for v1, v2 in zip(ordered, ordered[1:]):
+        assert evenCompare(v1, v2)
+        assert not evenCompare(v2, v1)
+
+
 def test_distributedConnectionMap():
     for nodeCount in range(2, 25):
         print("testing for node count: {}".format(nodeCount))
@@ -149,3 +166,82 @@ def test_mostCommonElement_for_mixed_hashable():
     most_common, count = mostCommonElement(elements)
     assert most_common == 4
     assert count == 3
+
+
+def test_checkIfMoreThanFSameItems():
+    items = [{'a': 1, 'b': 2}, {'b': 2, 'a': 1}, {'a': 3}, {'b': 2, 'a': 1}]
+    assert checkIfMoreThanFSameItems(items, 2) == {'a': 1, 'b': 2}
+    assert checkIfMoreThanFSameItems(items, 3) is False
+    assert checkIfMoreThanFSameItems([], 0) is False
+    assert checkIfMoreThanFSameItems([None, float('nan')], 1) is False
+
+
+def test_prime_gen_segmented():
+    assert list(prime_gen_segmented(1)) == []
+    assert list(prime_gen_segmented(2)) == [2]
+    assert list(prime_gen_segmented(30)) == [2, 3, 5, 7, 11, 13, 17, 19, 23,
+                                             29]
+    primes = list(prime_gen_segmented(10000))
+    gen = prime_gen()
+    assert primes == [next(gen) for _ in range(len(primes))]
+
+
+def test_updateNamedTuple():
+    Point = namedtuple('Point', ['x', 'y'])
+    p = Point(1, 2)
+    assert updateNamedTuple(p, y=3) == Point(1, 3)
+    assert p == Point(1, 2)
+
+    state = CheckpointState(1, ['d1'], None, {}, False)
+    updated = updateNamedTuple(state, seqNo=2, isStable=True)
+    assert isinstance(updated, CheckpointState)
+    assert updated.seqNo == 2
+    assert updated.isStable
+    assert updated.digests == ['d1']
+    assert state.seqNo == 1
+
+
+def test_symmetric_encryption_round_trip():
+    encrypted, key = getSymmetricallyEncryptedVal('some secret')
+    assert not encrypted.startswith(AES_GCM_PREFIX)
+    assert getSymmetricallyDecryptedVal(encrypted, key) == b'some secret'
+
+    encrypted, key2 = getSymmetricallyEncryptedVal(b'some secret', key)
+    assert key2 == key
+    assert getSymmetricallyDecryptedVal(encrypted, bytes.fromhex(key)) == \
+        b'some secret'
+
+
+def test_symmetric_encryption_round_trip_aes_gcm(monkeypatch):
+    pytest.importorskip('cryptography')
+    monkeypatch.setattr(plenum.common.util, '_cpuHasAesNi', lambda: True)
+    encrypted, key = getSymmetricallyEncryptedVal('some secret',
+                                                  useAesGcm=True)
+    assert encrypted.startswith(AES_GCM_PREFIX)
+    assert getSymmetricallyDecryptedVal(encrypted, key) == b'some secret'
+
+    encrypted, key2 = getSymmetricallyEncryptedVal('some secret', key,
+                                                   useAesGcm=True)
+    assert key2 == key
+    assert getSymmetricallyDecryptedVal(encrypted, key) == b'some secret'
+
+
+def test_cryptonym_hex_round_trip():
+    hx = 'a1b2c3d4' * 8
+    cryptonym = getCryptonym(hx)
+    assert isinstance(cryptonym, str)
+    assert cryptonymToHex(cryptonym) == hx.encode()
+    assert getCryptonym(cryptonym) == cryptonym
+
+    friendly = hexToFriendly(hx)
+    assert friendly == hexToFriendly(hx.encode())
+    assert friendly.decode() == cryptonym
+    assert friendlyToHex(friendly) == hx.encode()
+
+
+def test_hexToFriendly_rejects_non_hex():
+    for invalid in ('ab cd', 'ab\ncd', b'ab cd', '0xab', 'xyz'):
+        with pytest.raises(ValueError):
+            hexToFriendly(invalid)
+    with pytest.raises(ValueError):
+        hexToFriendly('abc')
@@ -63,7 +63,8 @@ setup(
     extras_require={
         'tests': tests_require,
         'stats': ['python-firebase'],
-        'benchmark': ['pympler']
+        'benchmark': ['pympler'],
+        'aesni': ['cryptography']
     },
     tests_require=tests_require,
     scripts=['scripts/plenum', 'scripts/init_plenum_keys',
@@ -4,6 +4,10 @@ import string
 import sha3 as _sha3
 
 
+_HEX_SET = frozenset(string.hexdigits)
+_HEX_BYTES = frozenset(string.hexdigits.encode())
+
+
 def sha3_256(x):
     return _sha3.sha3_256(x).digest()
 
@@ -107,12 +111,9 @@ def isHex(val: str) -> bool:
     :return: whether the given str represents a hex value
     """
     if isinstance(val, bytes):
-        # only decodes utf-8 string
-        try:
-            val = val.decode()
-        except ValueError:
-            return False
-    return isinstance(val, str) and all(c in string.hexdigits for c in val)
+        # non ascii bytes are never hex digits, so no need to decode
+        return _HEX_BYTES.issuperset(val)
+    return isinstance(val, str) and _HEX_SET.issuperset(val)
 
 # decorator
 
@@ -20,7 +20,6 @@ def lxor(a, b):
 
 class adict(dict):
     """Dict with attr access to keys."""
-    marker = object()
 
     def __init__(self, **kwargs):
         super().__init__()
@@ -32,11 +31,9 @@ class adict(dict):
             value = adict(**value)
         super(adict, self).__setitem__(key, value)
 
-    def __getitem__(self, key):
-        found = self.get(key, adict.marker)
-        if found is adict.marker:
-            found = adict()
-            super(adict, self).__setitem__(key, found)
+    def __missing__(self, key):
+        found = adict()
+        super(adict, self).__setitem__(key, found)
         return found
 
     def copy(self):
@@ -46,7 +43,7 @@ class adict(dict):
         return adict(**self)
 
     __setattr__ = __setitem__
-    __getattr__ = __getitem__
+    __getattr__ = dict.__getitem__
 
 
 def get_func_name(f):
@@ -1,5 +1,5 @@
 import ctypes
-import random
+import os
 import string
 from binascii import unhexlify, hexlify
 
@@ -8,6 +8,9 @@ from stp_core.crypto.nacl_wrappers import Signer
 
 # TODO: move it to crypto repo
 
+_HEX_SET = frozenset(string.hexdigits)
+_HEX_BYTES = frozenset(string.hexdigits.encode())
+
 
 # TODO returning a None when a None is passed is non-obvious; refactor
 def cleanSeed(seed=None):
@@ -38,12 +41,9 @@ def isHex(val: str) -> bool:
     :return: whether the given str represents a hex value
     """
     if isinstance(val, bytes):
-        # only decodes utf-8 string
-        try:
-            val = val.decode()
-        except ValueError:
-            return False
-    return isinstance(val, str) and all(c in string.hexdigits for c in val)
+        # non ascii bytes are never hex digits, so no need to decode
+        return _HEX_BYTES.issuperset(val)
+    return isinstance(val, str) and _HEX_SET.issuperset(val)
 
 
 def ed25519SkToCurve25519(sk, toHex=False):
@@ -77,8 +77,7 @@ def getEd25519AndCurve25519Keys(seed=None):
 
 
 def randomSeed(size=32):
-    return ''.join(random.choice(string.hexdigits)
-                   for _ in range(size)).encode()
+    return os.urandom((size + 1) // 2).hex()[:size].encode()
 
 
 def isHexKey(key):
@@ -1,3 +1,4 @@
+import hashlib
 import socket
 from collections import OrderedDict
 from typing import List
@@ -13,7 +14,6 @@ from stp_core.network.exceptions import PortNotAvailable
 import itertools
 
 import math
-from libnacl import crypto_hash_sha256
 
 
 def checkPortAvailable(ha):
@@ -44,17 +44,21 @@ def checkPortAvailable(ha):
             sock.close()
 
 
+def evenCompareKey(a: str) -> bytes:
+    """
+    Sort key matching `evenCompare`, so `sorted(names, key=evenCompareKey)`
+    hashes each name once instead of once per comparison.
+    """
+    return hashlib.sha256(a.encode('utf-8')).digest()
+
+
 def evenCompare(a: str, b: str) -> bool:
     """
     A deterministic but more evenly distributed comparator than simple alphabetical.
     Useful when comparing consecutive strings and an even distribution is needed.
     Provides an even chance of returning true as often as false
     """
-    ab = a.encode('utf-8')
-    bb = b.encode('utf-8')
-    ac = crypto_hash_sha256(ab)
-    bc = crypto_hash_sha256(bb)
-    return ac < bc
+    return evenCompareKey(a) < evenCompareKey(b)
 
 
 def distributedConnectionMap(names: List[str]) -> OrderedDict:
@@ -67,11 +71,11 @@ def distributedConnectionMap(names: List[str]) -> OrderedDict:
     :return: a dictionary of name -> list(name).
     """
     names.sort()
-    combos = list(itertools.combinations(names, 2))
-    maxPer = math.ceil(len(list(combos)) / len(names))
+    nameCount = len(names)
+    maxPer = math.ceil((nameCount * (nameCount - 1) // 2) / nameCount)
     # maxconns = math.ceil(len(names) / 2)
     connmap = OrderedDict((n, []) for n in names)
-    for a, b in combos:
+    for a, b in itertools.combinations(names, 2):
         if len(connmap[a]) < maxPer:
             connmap[a].append(b)
         else:
@@ -0,0 +1,28 @@
+from stp_core.crypto.util import isHex, isHexKey, randomSeed
+
+
+def test_isHex():
+    assert isHex('0123456789abcdefABCDEF')
+    assert isHex(b'deadbeef')
+    assert not isHex('0xab')
+    assert not isHex(' ab')
+    assert not isHex('a_b')
+    assert not isHex('-1')
+    assert not isHex('xyz')
+    assert not isHex(b'\xff')
+    assert not isHex(123)
+
+
+def test_isHexKey():
+    assert isHexKey('a' * 64)
+    assert not isHexKey('a' * 63)
+    assert not isHexKey('g' * 64)
+
+
+def test_randomSeed():
+    for size in (1, 7, 32):
+        seed = randomSeed(size)
+        assert isinstance(seed, bytes)
+        assert len(seed) == size
+        assert isHex(seed)
+    assert randomSeed() != randomSeed()